@@ -6,9 +6,12 @@ import logging
 from datetime import datetime
 import re
 from pprint import pprint
-import json
+import orjson
 import os
 import csv
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Import Selenium related libraries
 from selenium import webdriver
@@ -17,11 +20,15 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Import HTTP and HTML parsing libraries
+import requests
+from lxml import etree, html
+
 # Set up logging to track what the script is doing
 logging.basicConfig(
     level=logging.INFO,  # Show all info messages
@@ -33,8 +40,108 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used while parsing listings
+_NON_DIGITS = re.compile(r'\D+')
+_COMMA_IN_NUM = re.compile(r'(\d+),(\d+)')
+_DETAIL_SPLIT = re.compile(r'\s*[-|]\s*')
+_PAGE_QS = re.compile(r'page=(\d+)')
+
+# Backoff settings used when the site rate-limits or shows a captcha
+_MAX_BACKOFF = 30.0  # seconds
+_BACKOFF_RECOVERY = 5  # consecutive successful pages before halving the delay
+_MAX_HTTP_ATTEMPTS = 5
+
+# Queued after the last row of each page so the CSV writer thread flushes once per page
+_PAGE_END = object()
+
+# Element locators used with Selenium
+_SEL_TILE = (By.CSS_SELECTOR, 'div._2v8Tq')
+_SEL_PAGE_ITEM = (By.CSS_SELECTOR, 'a[data-aut-id="pageItem"]')
+_SEL_NEXT_PAGE = (By.CSS_SELECTOR, 'a[data-aut-id="pagination-next"]')
+_SEL_CAPTCHA = (By.CSS_SELECTOR, 'iframe[src*="captcha"], iframe[title*="captcha" i]')
+
+# Resources that are not needed for scraping listing text
+_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.mp4',
+    '*/ads/*', '*doubleclick*', '*googletagmanager*'
+]
+
+# XPath queries used when reading listings from server-rendered HTML
+_XP_TILES = etree.XPath('//div[contains(concat(" ", normalize-space(@class), " "), " _2v8Tq ")]')
+_XP_TITLE = etree.XPath('.//div[@data-aut-id="itemTitle"]')
+_XP_PRICE = etree.XPath('.//span[@data-aut-id="itemPrice"]')
+_XP_SUBTITLE = etree.XPath('.//div[@data-aut-id="itemSubTitle"]')
+_XP_DETAILS = etree.XPath('.//div[@data-aut-id="itemDetails"]')
+
+# Scrolls to the bottom in random 100-400px steps with 0.5-1.5s pauses. Stops
+# after 25 seconds (pages that keep lazy-loading never reach the bottom) so
+# it always finishes within WebDriver's default 30 second script timeout
+_HUMAN_SCROLL_JS = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + 25000;
+let position = 0;
+const step = () => {
+    const height = document.body.scrollHeight;
+    if (position >= height || Date.now() > deadline) {
+        return done();
+    }
+    position = Math.min(height, position + 100 + Math.random() * 300);
+    window.scrollTo({top: position, behavior: 'smooth'});
+    setTimeout(step, 500 + Math.random() * 1000);
+};
+step();
+"""
+
+# Returns the highest numbered pagination link (0 if there is none)
+_LAST_PAGE_JS = """
+const pages = Array.from(document.querySelectorAll('a[data-aut-id="pageItem"]'))
+    .map(a => a.textContent.trim())
+    .filter(text => /^\\d+$/.test(text))
+    .map(text => parseInt(text, 10));
+return Math.max(0, ...pages);
+"""
+
+# Collects the text of every listing on the current page in one browser call
+_LISTINGS_JS = """
+const text = (el, sel) => {
+    const node = el.querySelector(sel);
+    return node ? node.innerText : null;
+};
+return Array.from(document.querySelectorAll('div._2v8Tq')).map(el => ({
+    title: text(el, 'div._2Gr10[data-aut-id="itemTitle"]'),
+    price: text(el, 'span._1zgtX[data-aut-id="itemPrice"]'),
+    subtitle: text(el, 'div._21gnE[data-aut-id="itemSubTitle"]'),
+    details: text(el, 'div._3VRSm[data-aut-id="itemDetails"]')
+}));
+"""
+
+def _node_text(tile, query: etree.XPath, lines: bool = False) -> Optional[str]:
+    """
+    Return the text of the first match, or None if nothing matches
+    
+    Inline markup is joined and whitespace collapsed into a single line, as
+    innerText does. With lines=True each text node goes on its own line
+    instead, for blocks like itemDetails whose parts the browser lays out on
+    separate lines with CSS.
+    """
+    nodes = query(tile)
+    if not nodes:
+        return None
+    if lines:
+        return '\n'.join(' '.join(t.split()) for t in nodes[0].itertext() if t.strip())
+    return ' '.join(''.join(nodes[0].itertext()).split())
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Return the Retry-After header in seconds, if it is given as a number"""
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
+
 class OLXScraper:
-    def __init__(self, base_url: str = None, headless: bool = False, use_proxy: bool = False):
+    def __init__(self, base_url: str = None, headless: bool = False, use_proxy: bool = False,
+                 use_http: bool = True, http_workers: int = 4):
         """
         Initialize the OLX scraper with necessary settings
         
@@ -42,6 +149,9 @@ class OLXScraper:
             base_url: The base URL of the OLX category to scrape
             headless: Whether to run Chrome in headless mode
             use_proxy: Whether to use a proxy server
+            use_http: Whether to fetch result pages over plain HTTP once the
+                browser session is set up (the browser is still used as a fallback)
+            http_workers: How many pages to download at the same time in HTTP mode
         """
         # Get the base URL from user if not provided
         if not base_url:
@@ -51,6 +161,17 @@ class OLXScraper:
             raise ValueError("Invalid URL. Please provide a valid OLX India URL.")
         
         self.base_url = base_url
+        self.use_http = use_http
+        self.http_workers = http_workers
+        
+        # Extra delay between pages, raised when the site starts blocking us
+        self._backoff_delay = 0.0
+        self._backoff_successes = 0
+        self._backoff_raised_at = 0.0
+        self._backoff_lock = threading.Lock()
+        
+        # Shared WebDriverWait, created once the driver is set up
+        self._wait = None
         
         # Extract category name from URL for file naming
         try:
@@ -87,6 +208,12 @@ class OLXScraper:
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # Skip images and notification prompts - only listing text is needed
+        self.chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        
         # Cookie file path - make it category specific
         self.cookie_file = f'olx_{self.category}_cookies.json'
         
@@ -101,19 +228,59 @@ class OLXScraper:
         with open(self.csv_filename, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=self.csv_headers)
             writer.writeheader()
+        
+        # Keep a single handle and writer open for appending rows; the 64 KB
+        # buffer holds a full page of rows, which is flushed at page boundaries
+        self._csv_fh = open(self.csv_filename, 'a', newline='', encoding='utf-8', buffering=64 * 1024)
+        self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=self.csv_headers)
+        
+        # Rows are written by a background thread so scraping never waits on disk
+        self._write_q = queue.Queue(maxsize=1024)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """Write queued rows to the CSV file, flushing once per page, until close() is called"""
+        while True:
+            item = self._write_q.get()
+            try:
+                if item is None or item is _PAGE_END:
+                    self._csv_fh.flush()
+                else:
+                    # Rows are written one at a time so a bad row only loses itself
+                    self._csv_writer.writerow(item)
+            except Exception as e:
+                if isinstance(item, dict):
+                    logger.error(f"Error saving to CSV (page {item.get('page_number')}, {item.get('title')!r}): {e}")
+                else:
+                    logger.error(f"Error flushing CSV file: {e}")
+            finally:
+                self._write_q.task_done()
+            
+            if item is None:
+                return
+
+    def close(self) -> None:
+        """Write any queued rows, then close the CSV output file"""
+        if self._writer_thread.is_alive():
+            self._write_q.put(None)
+            self._writer_thread.join()
+        if not self._csv_fh.closed:
+            self._csv_fh.close()
 
     def _save_cookies(self, driver) -> None:
         """Save cookies to file"""
-        if driver.get_cookies():
-            with open(self.cookie_file, 'w') as f:
-                json.dump(driver.get_cookies(), f)
+        cookies = driver.get_cookies()
+        if cookies:
+            with open(self.cookie_file, 'wb') as f:
+                f.write(orjson.dumps(cookies))
 
     def _load_cookies(self, driver) -> None:
         """Load cookies from file if they exist"""
         try:
             if os.path.exists(self.cookie_file):
-                with open(self.cookie_file, 'r') as f:
-                    cookies = json.load(f)
+                with open(self.cookie_file, 'rb') as f:
+                    cookies = orjson.loads(f.read())
                 for cookie in cookies:
                     driver.add_cookie(cookie)
                 driver.refresh()
@@ -122,20 +289,9 @@ class OLXScraper:
 
     def _simulate_human_scroll(self, driver) -> None:
         """Simulate human-like scrolling behavior"""
-        total_height = driver.execute_script("return document.body.scrollHeight")
-        viewport_height = driver.execute_script("return window.innerHeight")
-        current_position = 0
-        
-        while current_position < total_height:
-            # Random scroll amount between 100 and 400 pixels
-            scroll_amount = random.randint(100, 400)
-            current_position = min(current_position + scroll_amount, total_height)
-            
-            # Scroll smoothly
-            driver.execute_script(f"window.scrollTo({{top: {current_position}, behavior: 'smooth'}})")
-            
-            # Random pause between 0.5 and 1.5 seconds
-            time.sleep(random.uniform(0.5, 1.5))
+        # Runs entirely in the browser and re-reads the page height on every
+        # step, so content that lazy-loads while scrolling is also covered
+        driver.execute_async_script(_HUMAN_SCROLL_JS)
 
     def _setup_driver(self) -> webdriver.Chrome:
         """Set up and return a Chrome WebDriver instance"""
@@ -149,6 +305,10 @@ class OLXScraper:
             # Set page load timeout to 30 seconds
             driver.set_page_load_timeout(30)
             
+            # Block media, fonts and ad/tracking requests to speed up page loads
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URLS})
+            
             # Add script to make WebDriver less detectable
             driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
                 'source': '''
@@ -177,24 +337,58 @@ class OLXScraper:
             logger.error(f"Failed to set up Chrome driver: {str(e)}")
             raise
 
-    def _wait_for_element(self, driver, selector: str, timeout: int = 10) -> Optional[webdriver.remote.webelement.WebElement]:
-        """Wait for an element to be present and visible"""
+    def _wait_for_element(self, locator: Tuple[str, str]) -> Optional[webdriver.remote.webelement.WebElement]:
+        """Wait (up to 10 seconds) for an element to be present"""
         try:
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
-            return element
+            return self._wait.until(EC.presence_of_element_located(locator))
         except TimeoutException:
             return None
 
     def _clean_price(self, price_text: str) -> int:
         """Convert price text (e.g., "₹ 45,000") to a number (45000)"""
         try:
-            price = re.sub(r'[^\d]', '', price_text)
+            price = _NON_DIGITS.sub('', price_text)
             return int(price) if price else 0
         except ValueError:
             return 0
 
+    def _pause(self) -> None:
+        """Sleep for a short random delay plus any current backoff"""
+        time.sleep(random.uniform(0.2, 0.6) + self._backoff_delay)
+
+    def _record_block(self, retry_after: Optional[float] = None) -> None:
+        """Double the backoff delay (up to a limit) after being rate-limited"""
+        with self._backoff_lock:
+            self._backoff_successes = 0
+            
+            # Several workers hitting the same rate limit count as one event:
+            # only raise the delay again once the current one has had time to apply
+            now = time.monotonic()
+            if now - self._backoff_raised_at >= self._backoff_delay:
+                self._backoff_delay = min(_MAX_BACKOFF, max(1.0, self._backoff_delay * 2))
+                self._backoff_raised_at = now
+            
+            # Respect the server's own Retry-After hint when it asks for longer
+            if retry_after and retry_after > self._backoff_delay:
+                self._backoff_delay = min(_MAX_BACKOFF, retry_after)
+                self._backoff_raised_at = now
+            
+            logger.warning(f"Backing off: waiting an extra {self._backoff_delay:.0f}s between pages")
+
+    def _record_success(self) -> None:
+        """Halve the backoff delay after enough consecutive successful pages"""
+        with self._backoff_lock:
+            if not self._backoff_delay:
+                return
+            self._backoff_successes += 1
+            if self._backoff_successes >= _BACKOFF_RECOVERY:
+                self._backoff_delay = self._backoff_delay / 2 if self._backoff_delay > 1 else 0.0
+                self._backoff_successes = 0
+
+    def _is_blocked(self, driver) -> bool:
+        """Check whether the current page is showing a captcha"""
+        return bool(driver.find_elements(*_SEL_CAPTCHA))
+
     def wait_for_user_action(self, message: str) -> None:
         """Wait for user to perform an action and continue"""
         input(f"\n{message} Press Enter to continue...")
@@ -203,13 +397,11 @@ class OLXScraper:
     def get_total_pages(self, driver) -> int:
         """Get the total number of pages available"""
         try:
-            # Find all page numbers
-            page_elements = driver.find_elements(By.CSS_SELECTOR, 'a[data-aut-id="pageItem"]')
-            if not page_elements:
+            # Read the highest page number from the pagination links in one call
+            last_page = driver.execute_script(_LAST_PAGE_JS)
+            if not last_page:
                 return 1
             
-            # Get the last page number
-            last_page = max(int(elem.text) for elem in page_elements if elem.text.isdigit())
             logger.info(f"Total pages found: {last_page}")
             return last_page
         except Exception as e:
@@ -217,12 +409,10 @@ class OLXScraper:
             return 1
 
     def save_to_csv(self, data: Dict, page_number: int) -> None:
-        """Save a single listing to CSV file"""
+        """Queue a single listing to be written to the CSV file"""
         try:
             data['page_number'] = page_number
-            with open(self.csv_filename, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.csv_headers)
-                writer.writerow(data)
+            self._write_q.put(data)
         except Exception as e:
             logger.error(f"Error saving to CSV: {e}")
 
@@ -230,7 +420,7 @@ class OLXScraper:
         """Try to navigate to a page using UI elements (more human-like)"""
         try:
             # Find the target page button
-            page_buttons = driver.find_elements(By.CSS_SELECTOR, 'a[data-aut-id="pageItem"]')
+            page_buttons = driver.find_elements(*_SEL_PAGE_ITEM)
             for button in page_buttons:
                 if button.text.strip() == str(target_page):
                     # Move mouse to button (human-like)
@@ -244,14 +434,14 @@ class OLXScraper:
                     # Verify we reached the correct page
                     current_url = driver.current_url
                     if "page=" in current_url:
-                        current_page = int(re.search(r'page=(\d+)', current_url).group(1))
+                        current_page = int(_PAGE_QS.search(current_url).group(1))
                         if current_page == target_page:
                             return True
                     
                     return False
             
             # If target page button not found, try using Next button
-            next_button = driver.find_element(By.CSS_SELECTOR, 'a[data-aut-id="pagination-next"]')
+            next_button = driver.find_element(*_SEL_NEXT_PAGE)
             if next_button and next_button.is_displayed():
                 next_button.click()
                 time.sleep(random.uniform(2, 3))
@@ -279,27 +469,26 @@ class OLXScraper:
             logger.error(f"Error in URL navigation: {e}")
             return False
 
-    def extract_listing_data(self, driver, listing_element, page_number: int) -> Optional[Dict]:
-        """Extract data from a single listing"""
+    def extract_listing_data(self, raw: Dict, page_number: int) -> Optional[Dict]:
+        """Parse the raw text of a single listing (as returned by _LISTINGS_JS)"""
         try:
             # Extract basic information (common across all categories)
-            title = listing_element.find_element(By.CSS_SELECTOR, 'div._2Gr10[data-aut-id="itemTitle"]').text.strip()
+            if raw.get('title') is None:
+                raise ValueError("listing has no title")
+            title = raw['title'].strip()
             
-            try:
-                price = self._clean_price(listing_element.find_element(By.CSS_SELECTOR, 'span._1zgtX[data-aut-id="itemPrice"]').text)
-            except:
-                price = 0
+            price = self._clean_price(raw.get('price') or '')
             
-            try:
-                details = listing_element.find_element(By.CSS_SELECTOR, 'div._21gnE[data-aut-id="itemSubTitle"]').text.strip()
+            # Initialize year and kilometers
+            year = ""
+            kilometers = ""
+            
+            if raw.get('subtitle'):
+                details = raw['subtitle'].strip()
                 # First remove commas from numbers (e.g., "12,017 km" -> "12017 km")
-                details = re.sub(r'(\d+),(\d+)', r'\1\2', details)
+                details = _COMMA_IN_NUM.sub(r'\1\2', details)
                 # Split details by separators while preserving "km" with its number
-                detail_parts = [d.strip() for d in re.split(r'\s*[-|]\s*', details) if d.strip()]
-                
-                # Initialize year and kilometers
-                year = ""
-                kilometers = ""
+                detail_parts = [d.strip() for d in _DETAIL_SPLIT.split(details) if d.strip()]
                 
                 # First part is typically the year
                 if len(detail_parts) > 0:
@@ -307,24 +496,17 @@ class OLXScraper:
                 # Second part typically contains the kilometers
                 if len(detail_parts) > 1:
                     kilometers = detail_parts[1]
-            except:
-                year = ""
-                kilometers = ""
             
-            try:
-                # Updated selector for location and date
-                details_element = listing_element.find_element(By.CSS_SELECTOR, 'div._3VRSm[data-aut-id="itemDetails"]')
-                full_text = details_element.text.strip()
-                
+            if raw.get('details'):
                 # Split text into parts
-                parts = full_text.split('\n')
+                parts = raw['details'].strip().split('\n')
                 
                 # First part before == is location
                 location = parts[0].split('==')[0].strip()
                 
                 # Last part is the date
                 listing_date = parts[-1].strip()
-            except:
+            else:
                 location = "Unknown"
                 listing_date = "Unknown"
             
@@ -349,12 +531,163 @@ class OLXScraper:
             logger.error(f"Error extracting listing data: {e}")
             return None
 
+    def _process_listings(self, listings: List[Dict], page_number: int) -> None:
+        """Parse and save all raw listings collected from one page"""
+        logger.info(f"Found {len(listings)} listings on page {page_number}")
+        
+        # Process each listing
+        for idx, listing in enumerate(listings, 1):
+            data = self.extract_listing_data(listing, page_number)
+            if not data:
+                logger.warning(f"Failed to extract data for listing {idx} on page {page_number}")
+        
+        # Have the writer thread flush this page's rows to disk
+        self._write_q.put(_PAGE_END)
+
+    def _create_http_session(self, driver) -> requests.Session:
+        """Create an HTTP session that reuses the browser's cookies and user agent"""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': driver.execute_script("return navigator.userAgent"),
+            'Accept-Language': 'en-US,en;q=0.9'
+        })
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'],
+                                domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        return session
+
+    def _fetch_listings_http(self, session: requests.Session, page_number: int) -> List[Dict]:
+        """Download a results page and read the raw text of its listings"""
+        response = session.get(f"{self.base_url}?page={page_number}", timeout=30)
+        response.raise_for_status()
+        
+        tree = html.fromstring(response.content)
+        return [
+            {
+                'title': _node_text(tile, _XP_TITLE),
+                'price': _node_text(tile, _XP_PRICE),
+                'subtitle': _node_text(tile, _XP_SUBTITLE),
+                'details': _node_text(tile, _XP_DETAILS, lines=True)
+            }
+            for tile in _XP_TILES(tree)
+        ]
+
+    def _fetch_page_http(self, sessions: queue.Queue, page_number: int) -> List[Dict]:
+        """Fetch one page with a session of its own (runs in a worker thread, never raises)"""
+        # requests.Session is not documented as thread-safe, so each
+        # concurrent fetch borrows a separate session from the pool
+        session = sessions.get()
+        try:
+            return self._fetch_page_with_retries(session, page_number)
+        except Exception as e:
+            logger.error(f"Unexpected error fetching page {page_number}: {e}")
+            return []
+        finally:
+            sessions.put(session)
+
+    def _fetch_page_with_retries(self, session: requests.Session, page_number: int) -> List[Dict]:
+        """Fetch one page, backing off while the server rate-limits"""
+        for attempt in range(1, _MAX_HTTP_ATTEMPTS + 1):
+            self._pause()
+            try:
+                listings = self._fetch_listings_http(session, page_number)
+                self._record_success()
+                return listings
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 429:
+                    logger.warning(f"Rate limited on page {page_number} (attempt {attempt}/{_MAX_HTTP_ATTEMPTS})")
+                    self._record_block(_retry_after_seconds(e.response))
+                    continue
+                logger.error(f"HTTP request for page {page_number} failed: {e}")
+                return []
+            except requests.RequestException as e:
+                logger.error(f"HTTP request for page {page_number} failed: {e}")
+                return []
+            except etree.ParserError as e:
+                # e.g. an empty body from an anti-bot interstitial
+                logger.error(f"Could not parse HTML for page {page_number}: {e}")
+                return []
+        
+        logger.error(f"Giving up on page {page_number} over HTTP after {_MAX_HTTP_ATTEMPTS} attempts")
+        return []
+
+    def _scrape_pages_http(self, driver, start_page: int, total_pages: int) -> None:
+        """Fetch pages concurrently over plain HTTP, using the browser only as a fallback"""
+        sessions = queue.Queue()
+        for _ in range(self.http_workers):
+            sessions.put(self._create_http_session(driver))
+        pages = range(start_page, total_pages + 1)
+        
+        # Pages are downloaded in parallel but handed back in page order,
+        # so all parsing and CSV writing stays on this thread
+        with ThreadPoolExecutor(max_workers=self.http_workers) as pool:
+            results = pool.map(lambda page: self._fetch_page_http(sessions, page), pages)
+            for current_page, listings in zip(pages, results):
+                try:
+                    logger.info(f"Processing page {current_page}/{total_pages}")
+                    
+                    # Listings may be rendered client-side, so let the browser try
+                    if not listings:
+                        logger.warning(f"No listings in HTML for page {current_page}, loading it in the browser...")
+                        if self.navigate_to_page_url(driver, current_page):
+                            self._wait_for_element(_SEL_TILE)
+                            listings = driver.execute_script(_LISTINGS_JS)
+                    
+                    self._process_listings(listings, current_page)
+                    
+                except Exception as e:
+                    logger.error(f"Error processing page {current_page}: {e}")
+                    self.wait_for_user_action("Error occurred. Please check if everything is okay.")
+
+    def _scrape_pages_browser(self, driver, start_page: int, total_pages: int) -> None:
+        """Walk through pages in the browser, extracting listings from each"""
+        # Iterate through pages
+        current_page = start_page
+        while current_page <= total_pages:
+            try:
+                logger.info(f"Processing page {current_page}/{total_pages}")
+                
+                # Slow down and let the user solve any captcha before continuing
+                if self._is_blocked(driver):
+                    self._record_block()
+                    self.wait_for_user_action("Captcha detected. Please solve it.")
+                else:
+                    self._record_success()
+                
+                # Read the text of every listing in a single round trip
+                if not self._wait_for_element(_SEL_TILE):
+                    logger.warning(f"No listings appeared on page {current_page}")
+                listings = driver.execute_script(_LISTINGS_JS)
+                self._process_listings(listings, current_page)
+                
+                # Try UI navigation first
+                if current_page < total_pages:
+                    navigation_successful = self.navigate_to_page_ui(driver, current_page + 1)
+                    
+                    # If UI navigation fails, try URL navigation
+                    if not navigation_successful:
+                        logger.warning("UI navigation failed, trying direct URL...")
+                        if not self.navigate_to_page_url(driver, current_page + 1):
+                            logger.error("Navigation failed. Stopping scraper.")
+                            break
+                
+                current_page += 1
+                self._pause()
+                
+            except Exception as e:
+                logger.error(f"Error processing page {current_page}: {e}")
+                self.wait_for_user_action("Error occurred. Please check if everything is okay.")
+
     def scrape_listings(self, start_page: int = 1, max_pages: Optional[int] = None) -> None:
         """Main function to scrape listings across multiple pages"""
+        if not self._writer_thread.is_alive():
+            raise RuntimeError("Scraper has been closed; create a new OLXScraper to scrape again")
+        
         driver = None
         try:
             logger.info("Starting OLX scraper...")
             driver = self._setup_driver()
+            self._wait = WebDriverWait(driver, 10)
             
             # Load first page
             driver.get(self.base_url)
@@ -379,54 +712,25 @@ class OLXScraper:
             
             logger.info(f"Will scrape {total_pages} pages starting from page {start_page}")
             
-            # Iterate through pages
-            current_page = start_page
-            while current_page <= total_pages:
-                try:
-                    logger.info(f"Processing page {current_page}/{total_pages}")
-                    
-                    # Find listings
-                    listings = driver.find_elements(By.CSS_SELECTOR, 'div._2v8Tq')
-                    logger.info(f"Found {len(listings)} listings on page {current_page}")
-                    
-                    # Process each listing
-                    for idx, listing in enumerate(listings, 1):
-                        try:
-                            data = self.extract_listing_data(driver, listing, current_page)
-                            if not data:
-                                logger.warning(f"Failed to extract data for listing {idx} on page {current_page}")
-                        except StaleElementReferenceException:
-                            logger.warning(f"Listing {idx} on page {current_page} became stale, skipping...")
-                            continue
-                    
-                    # Try UI navigation first
-                    if current_page < total_pages:
-                        navigation_successful = self.navigate_to_page_ui(driver, current_page + 1)
-                        
-                        # If UI navigation fails, try URL navigation
-                        if not navigation_successful:
-                            logger.warning("UI navigation failed, trying direct URL...")
-                            if not self.navigate_to_page_url(driver, current_page + 1):
-                                logger.error("Navigation failed. Stopping scraper.")
-                                break
-                    
-                    current_page += 1
-                    time.sleep(random.uniform(3, 6))
-                    
-                except Exception as e:
-                    logger.error(f"Error processing page {current_page}: {e}")
-                    self.wait_for_user_action("Error occurred. Please check if everything is okay.")
+            if self.use_http:
+                self._scrape_pages_http(driver, start_page, total_pages)
+            else:
+                self._scrape_pages_browser(driver, start_page, total_pages)
             
             logger.info("Scraping completed successfully!")
             
         except Exception as e:
             logger.error(f"Fatal error: {e}")
         finally:
+            # Make sure every scraped row has reached the file
+            if self._writer_thread.is_alive():
+                self._write_q.join()
             if driver:
                 driver.quit()
 
 def main():
     """Main function that runs the scraper"""
+    scraper = None
     try:
         # Get the base URL from user
         base_url = input("Enter the OLX category URL to scrape (press Enter for motorcycles): ").strip()
@@ -463,6 +767,9 @@ def main():
         
     except Exception as e:
         logger.error(f"Error in main execution: {e}")
+    finally:
+        if scraper:
+            scraper.close()
 
 # This is the entry point of the script
 if __name__ == "__main__":